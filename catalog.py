@@ -0,0 +1,418 @@
+import argparse
+import json
+import re
+import sys
+import time
+from urllib.parse import urlsplit
+
+# Shared helpers for the catalogue in client/public/mindmap_data.json, plus a
+# command line for checking addition batches before any add_*.py style script
+# writes them:
+#
+#   python catalog.py check batch.json
+#   python catalog.py check batch.json --format json --strict
+#
+# A batch is JSON in any of the shapes the add_*.py scripts already use:
+#   - a list of tools carrying "category" and "subcategory" (names or ids)
+#   - a list of {"category", "subcategory", "tool": {...}}
+#   - a nested {category: {subcategory: [tools]}} mapping
+#   - {"add": <one of the above>, "replace": {category: [subcategories]}}
+# Nothing is ever written; the exit code is 1 when errors are found.
+
+CATALOG_PATH = 'client/public/mindmap_data.json'
+
+REQUIRED_FIELDS = {'name': str, 'url': str, 'description': str, 'pricing': str}
+OPTIONAL_FIELDS = {
+    'id': (int, str),
+    'gem': bool,
+    'isGem': bool,
+    'featured': bool,
+    'isNew': bool,
+    'recentlyAdded': bool,
+}
+# Routing fields used by flat batches; stripped before the tool is stored.
+ROUTING_FIELDS = ('category', 'subcategory')
+BATCH_KEYS = ('add', 'replace')
+
+
+def load_catalog(path=CATALOG_PATH):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def iter_tools(data):
+    for cat in data['categories']:
+        for sub in cat.get('subcategories', []):
+            for tool in sub.get('tools', []):
+                yield cat, sub, tool
+
+
+def subcategory_keys(data):
+    # Every way a batch may address a subcategory: "catId|subId" and
+    # "Category Name|Subcategory Name", both mapping to the id pair.
+    keys = {}
+    for cat in data['categories']:
+        for sub in cat.get('subcategories', []):
+            ids = (cat['id'], sub['id'])
+            keys[f"{cat['id']}|{sub['id']}"] = ids
+            keys[f"{cat['name']}|{sub['name']}"] = ids
+    return keys
+
+
+def category_keys(data):
+    keys = {}
+    for cat in data['categories']:
+        keys[cat['id']] = cat['id']
+        keys[cat['name']] = cat['id']
+    return keys
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'tool'
+
+
+def tool_keys(data):
+    # Identity of every tool that survives reordering, keyed by (category id,
+    # subcategory id, position): "<category>/<subcategory>/<name slug>", with
+    # "#2", "#3"... for a name repeated inside one subcategory.
+    keys = {}
+    seen = set()
+    for cat in data['categories']:
+        for sub in cat.get('subcategories', []):
+            for i, tool in enumerate(sub.get('tools', [])):
+                base = f"{cat['id']}/{sub['id']}/{slugify(tool['name'])}"
+                key, n = base, 1
+                while key in seen:
+                    n += 1
+                    key = f'{base}#{n}'
+                seen.add(key)
+                keys[(cat['id'], sub['id'], i)] = key
+    return keys
+
+
+def tool_slugs(data, previous=None):
+    # Public id for every tool, keyed by (category id, subcategory id,
+    # position). Most tools have no "id" field, so the name is used; a name
+    # that repeats gets its subcategory appended. Which tool gets the bare
+    # slug depends on catalogue order, so pass the {tool key: slug} map of an
+    # earlier run as previous: those tools keep their slugs, and a new tool
+    # sharing a name cannot take over an existing page.
+    previous = previous or {}
+    keys = tool_keys(data)
+    slugs = {}
+    taken = set()
+    for pos, key in keys.items():
+        slug = previous.get(key)
+        if slug and slug not in taken:
+            taken.add(slug)
+            slugs[pos] = slug
+    for cat in data['categories']:
+        for sub in cat.get('subcategories', []):
+            for i, tool in enumerate(sub.get('tools', [])):
+                if (cat['id'], sub['id'], i) in slugs:
+                    continue
+                slug = slugify(tool['name'])
+                if slug in taken:
+                    slug = f"{slug}-{sub['id']}"
+                while slug in taken:
+                    slug += '-2'
+                taken.add(slug)
+                slugs[(cat['id'], sub['id'], i)] = slug
+    return slugs
+
+
+def normalize_id(value):
+    # The catalogue mixes integer ids (add_final_tools.py) with "tool-N"
+    # strings (add_new_tools.py); both name the same number space.
+    if isinstance(value, str):
+        match = re.fullmatch(r'tool-(\d+)', value)
+        return int(match.group(1)) if match else value
+    return value
+
+
+def id_scheme(value):
+    if isinstance(value, int):
+        return 'integer'
+    return '"tool-N" string' if re.fullmatch(r'tool-\d+', value) else 'free-form string'
+
+
+def normalize_name(name):
+    return ' '.join(name.lower().split())
+
+
+def normalize_url(url):
+    # None for a URL urlsplit rejects; url_problem() reports those.
+    try:
+        parts = urlsplit(url.strip().lower())
+    except ValueError:
+        return None
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    return host + parts.path.rstrip('/')
+
+
+def url_problem(url):
+    if url != url.strip() or any(c.isspace() for c in url):
+        return 'contains whitespace'
+    try:
+        parts = urlsplit(url)
+        port = parts.port  # noqa: F841 - raises ValueError on a bad port
+    except ValueError as e:
+        return str(e)
+    if parts.scheme not in ('http', 'https'):
+        return f'scheme must be http or https, got {parts.scheme or "none"!r}'
+    if not parts.hostname or '.' not in parts.hostname:
+        return f'invalid host {parts.hostname or ""!r}'
+    return None
+
+
+class Report:
+    def __init__(self):
+        self.issues = []
+
+    def add(self, severity, code, where, message):
+        self.issues.append({'severity': severity, 'code': code, 'where': where, 'message': message})
+
+    def error(self, code, where, message):
+        self.add('error', code, where, message)
+
+    def warning(self, code, where, message):
+        self.add('warning', code, where, message)
+
+    def count(self, severity):
+        return sum(1 for i in self.issues if i['severity'] == severity)
+
+
+def batch_entries(batch):
+    # Flatten every supported batch shape into (where, category, subcategory, tool).
+    if isinstance(batch, dict) and any(key in batch for key in BATCH_KEYS):
+        batch = batch.get('add', [])
+    if isinstance(batch, list):
+        for i, item in enumerate(batch):
+            where = f'[{i}]'
+            if isinstance(item, dict) and isinstance(item.get('tool'), dict):
+                yield where, item.get('category'), item.get('subcategory'), item['tool']
+            elif isinstance(item, dict):
+                tool = {k: v for k, v in item.items() if k not in ROUTING_FIELDS}
+                yield where, item.get('category'), item.get('subcategory'), tool
+            else:
+                yield where, None, None, item
+    elif isinstance(batch, dict):
+        for cat, subs in batch.items():
+            if not isinstance(subs, dict):
+                yield cat, cat, None, subs
+                continue
+            for sub, tools in subs.items():
+                if not isinstance(tools, list):
+                    yield f'{cat}/{sub}', cat, sub, tools
+                    continue
+                for i, tool in enumerate(tools):
+                    yield f'{cat}/{sub}[{i}]', cat, sub, tool
+
+
+def check_tool(report, where, tool):
+    if not isinstance(tool, dict):
+        report.error('schema', where, f'tool must be an object, got {type(tool).__name__}')
+        return False
+    ok = True
+    for field, kind in REQUIRED_FIELDS.items():
+        value = tool.get(field)
+        if value is None:
+            report.error('schema', where, f'missing required field {field!r}')
+            ok = False
+        elif not isinstance(value, kind):
+            report.error('schema', where, f'{field!r} must be {kind.__name__}, got {type(value).__name__}')
+            ok = False
+        elif not value.strip():
+            report.error('schema', where, f'{field!r} is empty')
+            ok = False
+    for field, value in tool.items():
+        if field in REQUIRED_FIELDS:
+            continue
+        kind = OPTIONAL_FIELDS.get(field)
+        if kind is None:
+            report.warning('schema', where, f'unknown field {field!r}')
+        elif not isinstance(value, kind) or (kind is not bool and isinstance(value, bool)):
+            names = '/'.join(k.__name__ for k in kind) if isinstance(kind, tuple) else kind.__name__
+            report.error('schema', where, f'{field!r} must be {names}, got {type(value).__name__}')
+            ok = False
+    if isinstance(tool.get('url'), str):
+        problem = url_problem(tool['url'])
+        if problem:
+            report.error('url', where, f"bad url {tool['url']!r}: {problem}")
+    return ok
+
+
+def check_replacements(report, replace, data, cat_keys):
+    # add_music_tools.py style rewrites: every tool that is dropped is reported.
+    if not isinstance(replace, dict):
+        report.error('schema', 'replace', 'replace must map a category to its new subcategories')
+        return
+    by_id = {cat['id']: cat for cat in data['categories']}
+    for cat_ref, new_subs in replace.items():
+        where = f'replace/{cat_ref}'
+        cat_id = cat_keys.get(cat_ref)
+        if cat_id is None:
+            report.error('category', where, f'unknown category {cat_ref!r}')
+            continue
+        if not isinstance(new_subs, list):
+            report.error('schema', where, 'replacement must be a list of subcategories')
+            continue
+        kept = set()
+        for sub in new_subs:
+            if isinstance(sub, dict):
+                kept.update(normalize_name(t['name']) for t in sub.get('tools', [])
+                            if isinstance(t, dict) and isinstance(t.get('name'), str))
+        new_ids = {sub.get('id') for sub in new_subs if isinstance(sub, dict) and isinstance(sub.get('id'), str)}
+        for sub in by_id[cat_id].get('subcategories', []):
+            dropped = [t['name'] for t in sub.get('tools', []) if normalize_name(t['name']) not in kept]
+            if sub['id'] not in new_ids:
+                report.error('destructive', where,
+                             f"removes subcategory {sub['id']!r} ({len(sub.get('tools', []))} tools)")
+            if dropped:
+                report.error('destructive', where,
+                             f"drops {len(dropped)} tools from {sub['id']!r}: {', '.join(dropped)}")
+
+
+def check_batch(batch, data):
+    report = Report()
+    sub_keys = subcategory_keys(data)
+    cat_keys = category_keys(data)
+
+    # Catalogue indexes, built once so each entry is a handful of set lookups.
+    existing_names = {}
+    existing_urls = {}
+    existing_ids = {}
+    schemes = {}
+    for cat, sub, tool in iter_tools(data):
+        location = f"{cat['id']}/{sub['id']}"
+        existing_names.setdefault((cat['id'], sub['id'], normalize_name(tool['name'])), location)
+        url = normalize_url(tool['url'])
+        if url is not None:
+            existing_urls.setdefault(url, f"{tool['name']} in {location}")
+        if isinstance(tool.get('id'), (int, str)):
+            existing_ids.setdefault(normalize_id(tool['id']), tool['id'])
+            scheme = id_scheme(tool['id'])
+            schemes[scheme] = schemes.get(scheme, 0) + 1
+    catalog_scheme = max(schemes, key=schemes.get) if schemes else None
+
+    if isinstance(batch, dict) and any(key in batch for key in BATCH_KEYS):
+        for key in batch:
+            if key not in BATCH_KEYS:
+                report.error('schema', key, f'unexpected top-level key {key!r} next to "add"/"replace"')
+
+    seen_names = {}
+    seen_urls = {}
+    seen_ids = {}
+    total = 0
+    for where, cat_ref, sub_ref, tool in batch_entries(batch):
+        total += 1
+        valid = check_tool(report, where, tool)
+
+        routing_ok = True
+        for field, value in (('category', cat_ref), ('subcategory', sub_ref)):
+            if not isinstance(value, str):
+                report.error('schema', where, f'{field!r} must be str, got {type(value).__name__}')
+                routing_ok = False
+        if not routing_ok:
+            continue
+
+        ids = sub_keys.get(f'{cat_ref}|{sub_ref}')
+        if ids is None:
+            if cat_ref not in cat_keys:
+                report.error('category', where, f'unknown category {cat_ref!r}')
+            else:
+                report.error('subcategory', where, f'unknown subcategory {sub_ref!r} in {cat_ref!r}')
+        if not valid:
+            continue
+
+        name = normalize_name(tool['name'])
+        url = normalize_url(tool['url'])
+        if ids is not None:
+            key = (*ids, name)
+            if key in existing_names:
+                report.error('duplicate', where, f"{tool['name']!r} already exists in {existing_names[key]}")
+            elif key in seen_names:
+                report.error('duplicate', where, f"{tool['name']!r} repeats {seen_names[key]} in this batch")
+            else:
+                seen_names[key] = where
+        if url is not None:
+            if url in existing_urls:
+                report.warning('duplicate-url', where, f"{tool['url']} is already listed as {existing_urls[url]}")
+            elif url in seen_urls:
+                report.warning('duplicate-url', where, f"{tool['url']} repeats {seen_urls[url]} in this batch")
+            else:
+                seen_urls[url] = where
+
+        if isinstance(tool.get('id'), (int, str)) and not isinstance(tool['id'], bool):
+            tool_id = normalize_id(tool['id'])
+            if catalog_scheme and id_scheme(tool['id']) != catalog_scheme:
+                report.warning('id-scheme', where,
+                               f"id {tool['id']!r} uses the {id_scheme(tool['id'])} scheme; "
+                               f'the catalogue mostly uses {catalog_scheme} ids')
+            if tool_id in existing_ids:
+                report.error('duplicate-id', where,
+                             f"id {tool['id']!r} is already used in the catalogue as {existing_ids[tool_id]!r}")
+            elif tool_id in seen_ids:
+                report.error('duplicate-id', where, f"id {tool['id']!r} repeats {seen_ids[tool_id]} in this batch")
+            else:
+                seen_ids[tool_id] = where
+
+    if isinstance(batch, dict) and 'replace' in batch:
+        check_replacements(report, batch['replace'], data, cat_keys)
+
+    return total, report
+
+
+def print_report(total, report, elapsed):
+    for issue in report.issues:
+        print(f"{issue['severity'].upper()} [{issue['code']}] {issue['where']}: {issue['message']}")
+    if report.issues:
+        print()
+    print(f'Checked {total} entries in {elapsed * 1000:.1f} ms: '
+          f"{report.count('error')} errors, {report.count('warning')} warnings")
+
+
+def cmd_check(args):
+    start = time.perf_counter()
+    data = load_catalog(args.catalog)
+    with open(args.batch, 'r') as f:
+        batch = json.load(f)
+    total, report = check_batch(batch, data)
+    elapsed = time.perf_counter() - start
+
+    errors = report.count('error')
+    failed = errors > 0 or (args.strict and report.count('warning') > 0)
+    if args.format == 'json':
+        json.dump({
+            'ok': not failed,
+            'entries': total,
+            'errors': errors,
+            'warnings': report.count('warning'),
+            'issues': report.issues,
+        }, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(total, report, elapsed)
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Catalogue tooling for mindmap_data.json.')
+    parser.add_argument('--catalog', default=CATALOG_PATH, help='catalogue JSON to read')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    check = commands.add_parser('check', help='validate an addition batch without writing anything')
+    check.add_argument('batch', help='batch JSON file')
+    check.add_argument('--format', choices=('text', 'json'), default='text')
+    check.add_argument('--strict', action='store_true', help='treat warnings as errors')
+    check.set_defaults(func=cmd_check)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
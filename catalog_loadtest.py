@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from catalog_server import DEFAULT_PORT
+
+# Load test for catalog_server.py. Opens keep-alive connections, replays a mix
+# of listing, lookup, search and facet requests, and reports latency
+# percentiles and throughput.
+#
+#   python catalog_loadtest.py --spawn                        # start a local instance
+#   python catalog_loadtest.py --url http://127.0.0.1:8765 -c 64 -d 20
+#
+# With --revalidate, a share of requests sends the ETag from an earlier
+# response so the 304 path is exercised too.
+
+
+async def request(reader, writer, host, target, etag=None):
+    head = f'GET {target} HTTP/1.1\r\nHost: {host}\r\n'
+    if etag:
+        head += f'If-None-Match: {etag}\r\n'
+    writer.write((head + '\r\n').encode())
+    await writer.drain()
+    lines = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers.get('etag'), body
+
+
+async def build_targets(host, port):
+    # Discover real ids so lookups and filters hit the catalogue.
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, _, body = await request(reader, writer, host, '/categories')
+        categories = json.loads(body)['categories']
+        _, _, body = await request(reader, writer, host, '/tools?per_page=100')
+        tools = json.loads(body)['items']
+    finally:
+        writer.close()
+    targets = ['/categories']
+    for cat in categories:
+        targets.append(f"/categories/{cat['id']}")
+        targets.append(f"/categories/{cat['id']}?page=2&per_page=10")
+        targets.append(f"/tools?category={cat['id']}&gem=true")
+    for tool in tools:
+        targets.append(f"/tools/{tool['id']}")
+        targets.append(f"/search?q={tool['name'][:3].lower().replace(' ', '%20')}")
+    targets += ['/tools?pricing=free', '/tools?pricing=freemium&featured=true', '/tools?pricing=paid&page=2']
+    return targets
+
+
+async def worker(host, port, targets, deadline, remaining, revalidate, latencies, statuses, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        while time.perf_counter() < deadline and remaining[0] != 0:
+            remaining[0] -= 1
+            target = rng.choice(targets)
+            etag = etags.get(target) if revalidate and rng.random() < revalidate else None
+            start = time.perf_counter()
+            status, new_etag, _ = await request(reader, writer, host, target, etag)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if new_etag:
+                etags[target] = new_etag
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run(args):
+    parts = urlsplit(args.url)
+    host, port = parts.hostname, parts.port or 80
+    targets = await build_targets(host, port)
+    latencies = []
+    statuses = {}
+    remaining = [args.requests or -1]
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        worker(host, port, targets, deadline, remaining, args.revalidate, latencies, statuses,
+               random.Random(rng.random()))
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f'{len(latencies)} requests in {elapsed:.2f}s over {args.concurrency} connections '
+          f'({len(targets)} distinct targets)')
+    print(f'  requests/sec  {len(latencies) / elapsed:,.0f}')
+    print(f'  p50           {percentile(latencies, 0.50) * 1000:.2f} ms')
+    print(f'  p99           {percentile(latencies, 0.99) * 1000:.2f} ms')
+    print(f'  max           {(latencies[-1] if latencies else 0) * 1000:.2f} ms')
+    print('  statuses      ' + ', '.join(f'{k}: {v}' for k, v in sorted(statuses.items())))
+
+
+async def wait_for_port(host, port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test catalog_server.py.')
+    parser.add_argument('--url', default=f'http://127.0.0.1:{DEFAULT_PORT}', help='server to test')
+    parser.add_argument('-c', '--concurrency', type=int, default=32, help='open connections')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='seconds to run')
+    parser.add_argument('-n', '--requests', type=int, default=0, help='stop after this many requests')
+    parser.add_argument('--revalidate', type=float, default=0.0,
+                        help='share of requests sent with If-None-Match (0-1)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--spawn', action='store_true', help='start a local catalog_server.py first')
+    args = parser.parse_args(argv)
+
+    parts = urlsplit(args.url)
+    server = None
+    if args.spawn:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog_server.py')
+        server = subprocess.Popen([sys.executable, script, '--host', parts.hostname,
+                                   '--port', str(parts.port or 80)])
+    try:
+        if server:
+            asyncio.run(wait_for_port(parts.hostname, parts.port or 80))
+        asyncio.run(run(args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,381 @@
+import argparse
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from catalog import CATALOG_PATH, tool_slugs
+from prerender import STATE_PATH, load_state, previous_slugs
+
+# Small read-only HTTP service over the catalogue. The file is parsed once into
+# in-memory indexes and swapped atomically when it changes on disk.
+#
+#   python catalog_server.py --port 8765
+#
+#   GET /categories                           categories with tool counts
+#   GET /categories/<id>?page=&per_page=      paged tools in a category
+#   GET /tools/<id>                           one tool (id = /tool/<id>/ page slug)
+#   GET /tools?category=&subcategory=&pricing=&gem=&featured=&page=&per_page=
+#   GET /search?q=<prefix>&page=&per_page=    prefix search over tool names
+#
+# Tool ids reuse the slugs prerender.py recorded in .prerender-state.json, so
+# they stay in step with the published pages.
+#
+# Every 200 carries an ETag; a matching If-None-Match gets a 304. Rendered
+# responses live in a bounded LRU cache that is dropped on reload.
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 1024
+RELOAD_INTERVAL = 2.0
+PER_PAGE = 20
+MAX_PER_PAGE = 100
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+# Everything route() reads from the query string; anything else is ignored and
+# kept out of the cache key.
+QUERY_PARAMS = ('category', 'subcategory', 'pricing', 'gem', 'featured', 'page', 'per_page', 'q')
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 431: 'Request Header Fields Too Large'}
+
+
+def pricing_bucket(pricing):
+    # Pricing is free text ("Free / $20/mo Plus", "$249+", "Subscription");
+    # bucket it so it can be filtered on.
+    text = pricing.lower()
+    if 'free' in text and ('paid' in text or '$' in text or '/' in text or 'plan' in text):
+        return 'freemium'
+    if 'freemium' in text or 'free trial' in text:
+        return 'freemium'
+    if 'free' in text or 'open source' in text:
+        return 'free'
+    return 'paid'
+
+
+def name_tokens(name):
+    return re.findall(r'[a-z0-9]+', name.lower())
+
+
+class CatalogIndex:
+    # Immutable once built; a reload builds a new one and swaps the reference.
+
+    def __init__(self, data, version, previous=None):
+        self.version = version
+        self.tools = []
+        self.by_id = {}
+        self.categories = []
+        self.facets = {'category': {}, 'subcategory': {}, 'pricing': {}, 'gem': {}, 'featured': {}}
+        tokens = []
+
+        slugs = tool_slugs(data, previous)
+        for cat in data['categories']:
+            subcategories = []
+            for sub in cat.get('subcategories', []):
+                for i, tool in enumerate(sub.get('tools', [])):
+                    idx = len(self.tools)
+                    record = {
+                        'id': slugs[(cat['id'], sub['id'], i)],
+                        'name': tool['name'],
+                        'url': tool['url'],
+                        'description': tool['description'],
+                        'pricing': tool['pricing'],
+                        'gem': bool(tool.get('gem') or tool.get('isGem')),
+                        'featured': bool(tool.get('featured')),
+                        'category': cat['id'],
+                        'subcategory': sub['id'],
+                    }
+                    self.tools.append(record)
+                    self.by_id[record['id']] = idx
+                    for facet, value in (('category', cat['id']), ('subcategory', sub['id']),
+                                         ('pricing', pricing_bucket(tool['pricing'])),
+                                         ('gem', str(record['gem']).lower()),
+                                         ('featured', str(record['featured']).lower())):
+                        self.facets[facet].setdefault(value, set()).add(idx)
+                    for token in set(name_tokens(tool['name'])):
+                        tokens.append((token, idx))
+                subcategories.append({'id': sub['id'], 'name': sub['name'],
+                                      'tools': len(sub.get('tools', []))})
+            self.categories.append({
+                'id': cat['id'],
+                'name': cat['name'],
+                'icon': cat.get('icon', ''),
+                'color': cat.get('color', ''),
+                'tools': sum(s['tools'] for s in subcategories),
+                'subcategories': subcategories,
+            })
+        tokens.sort()
+        self.token_keys = [t for t, _ in tokens]
+        self.token_ids = [i for _, i in tokens]
+        self.category_ids = {c['id'] for c in self.categories}
+
+    def prefix_matches(self, prefix):
+        lo = bisect.bisect_left(self.token_keys, prefix)
+        hi = bisect.bisect_left(self.token_keys, prefix + '\uffff')
+        return set(self.token_ids[lo:hi])
+
+    def search(self, query):
+        words = name_tokens(query)
+        if not words:
+            return []
+        matches = None
+        for word in words:
+            found = self.prefix_matches(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        # Names that start with the query first, then catalogue order.
+        q = query.strip().lower()
+        return sorted(matches, key=lambda i: (not self.tools[i]['name'].lower().startswith(q), i))
+
+    def filter(self, filters):
+        matches = None
+        for facet, value in filters.items():
+            found = self.facets[facet].get(value, set())
+            matches = found if matches is None else matches & found
+        return sorted(matches) if matches is not None else list(range(len(self.tools)))
+
+    def facet_counts(self, ids):
+        ids = set(ids)
+        return {facet: {value: len(members & ids) for value, members in sorted(values.items())
+                        if members & ids}
+                for facet, values in self.facets.items() if facet != 'subcategory'}
+
+
+def load_index(path, state_path=None):
+    # state_path: prerender.py state, so tool ids match the published pages.
+    with open(path, 'rb') as f:
+        raw = f.read()
+    previous = previous_slugs(load_state(state_path)) if state_path else None
+    return CatalogIndex(json.loads(raw), hashlib.sha256(raw).hexdigest()[:16], previous)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def int_param(query, name, default, low, high):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise HTTPError(400, f'{name} must be an integer')
+    if not low <= value <= high:
+        raise HTTPError(400, f'{name} must be between {low} and {high}')
+    return value
+
+
+def paged(index, ids, query):
+    page = int_param(query, 'page', 1, 1, 10 ** 6)
+    per_page = int_param(query, 'per_page', PER_PAGE, 1, MAX_PER_PAGE)
+    start = (page - 1) * per_page
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': len(ids),
+        'pages': (len(ids) + per_page - 1) // per_page,
+        'items': [index.tools[i] for i in ids[start:start + per_page]],
+    }
+
+
+def route(index, path, query):
+    parts = [unquote(p) for p in path.strip('/').split('/') if p]
+    if parts == ['categories']:
+        return {'categories': index.categories}
+    if len(parts) == 2 and parts[0] == 'categories':
+        if parts[1] not in index.category_ids:
+            raise HTTPError(404, f'unknown category {parts[1]!r}')
+        return paged(index, index.filter({'category': parts[1]}), query)
+    if len(parts) == 2 and parts[0] == 'tools':
+        idx = index.by_id.get(parts[1])
+        if idx is None:
+            raise HTTPError(404, f'unknown tool {parts[1]!r}')
+        return index.tools[idx]
+    if parts == ['tools']:
+        filters = {}
+        for facet in index.facets:
+            if query.get(facet):
+                filters[facet] = query[facet][0].lower() if facet in ('gem', 'featured') else query[facet][0]
+        ids = index.filter(filters)
+        return {**paged(index, ids, query), 'facets': index.facet_counts(ids)}
+    if parts == ['search']:
+        q = query.get('q', [''])[0]
+        if not q.strip():
+            raise HTTPError(400, 'q is required')
+        return paged(index, index.search(q), query)
+    raise HTTPError(404, f'no route for {path}')
+
+
+def etag_matches(header, etag):
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(',')]
+    return '*' in candidates or any(c.removeprefix('W/') == etag for c in candidates)
+
+
+class CatalogService:
+    def __init__(self, path, cache_size=CACHE_SIZE, state_path=None):
+        self.path = path
+        self.state_path = state_path
+        self.cache_size = cache_size
+        self.stat = self._stat()
+        # Index and cache are swapped together in a single assignment, so a
+        # request never sees a new index with the old cache or vice versa.
+        self.state = (load_index(path, state_path), OrderedDict())
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    async def watch(self, interval=RELOAD_INTERVAL):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                stat = self._stat()
+                if stat == self.stat:
+                    continue
+                index = await loop.run_in_executor(None, load_index, self.path, self.state_path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # Half-written or invalid file: keep serving the old index.
+                print(f'Reload failed, keeping version {self.state[0].version}: {e}', file=sys.stderr)
+                continue
+            self.stat = stat
+            if index.version != self.state[0].version:
+                self.state = (index, OrderedDict())
+                print(f'Reloaded catalogue: version {index.version}, {len(index.tools)} tools')
+
+    def respond(self, target):
+        # Returns (status, body, etag); 200s are served from / stored in the LRU.
+        index, cache = self.state
+        split = urlsplit(target)
+        query = parse_qs(split.query)
+        # route() only reads the first value of each parameter; keying on the
+        # decoded (name, value) pairs keeps '%26' inside a value distinct from '&'.
+        key = (split.path, tuple((name, query[name][0]) for name in QUERY_PARAMS if name in query))
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+            return hit
+        try:
+            body = json.dumps(route(index, split.path, query), separators=(',', ':')).encode()
+        except HTTPError as e:
+            return e.status, json.dumps({'error': str(e)}).encode(), None
+        etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+        entry = (200, body, etag)
+        cache[key] = entry
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return entry
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 431, b'{"error":"headers too large"}', None, False)
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self.send(writer, 400, b'{"error":"bad request line"}', None, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                # Nothing here takes a body, but one left in the stream would be
+                # parsed as the next request line: skip small ones, refuse the rest.
+                if 'transfer-encoding' in headers:
+                    await self.send(writer, 400, b'{"error":"request bodies are not supported"}', None, False)
+                    break
+                try:
+                    body_length = int(headers.get('content-length', '0'))
+                except ValueError:
+                    body_length = -1
+                if not 0 <= body_length <= MAX_BODY_BYTES:
+                    await self.send(writer, 400, b'{"error":"bad content-length"}', None, False)
+                    break
+                if body_length:
+                    try:
+                        await reader.readexactly(body_length)
+                    except asyncio.IncompleteReadError:
+                        break
+
+                if method not in ('GET', 'HEAD'):
+                    await self.send(writer, 405, b'{"error":"method not allowed"}', None, keep_alive)
+                else:
+                    status, body, etag = self.respond(target)
+                    if etag and etag_matches(headers.get('if-none-match'), etag):
+                        status, body = 304, b''
+                    await self.send(writer, status, b'' if method == 'HEAD' else body, etag, keep_alive,
+                                    length=len(body))
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, body, etag, keep_alive, length=None):
+        lines = [f'HTTP/1.1 {status} {STATUS_TEXT[status]}']
+        if status != 304:
+            lines.append('Content-Type: application/json')
+            lines.append(f'Content-Length: {len(body) if length is None else length}')
+        if etag:
+            lines.append(f'ETag: {etag}')
+            lines.append('Cache-Control: no-cache')
+        lines.append('Connection: ' + ('keep-alive' if keep_alive else 'close'))
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+
+
+async def serve(args):
+    service = CatalogService(args.catalog, cache_size=args.cache_size, state_path=args.state)
+    server = await asyncio.start_server(service.handle, args.host, args.port, limit=MAX_HEADER_BYTES)
+    index = service.state[0]
+    print(f'Serving {len(index.tools)} tools (version {index.version}) on http://{args.host}:{args.port}')
+    watcher = asyncio.create_task(service.watch(args.reload_interval))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve catalogue queries over HTTP.')
+    parser.add_argument('--catalog', default=CATALOG_PATH, help='catalogue JSON to serve')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--state', default=STATE_PATH,
+                        help='prerender.py state file whose tool slugs are reused as ids')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help='LRU response cache entries')
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL,
+                        help='seconds between catalogue file checks')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
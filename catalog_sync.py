@@ -0,0 +1,434 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog import load_catalog
+
+# Delta sync of client/public to VPS replicas (see DEPLOY_HOSTINGER_VPS.md).
+#
+# Every file under client/public becomes a leaf of a Merkle tree. The catalogue
+# itself is split into one shard per subcategory plus a skeleton, so a one-tool
+# edit only changes one shard; the replica rebuilds mindmap_data.json from its
+# shards. Sync compares the local tree with the manifest stored on the replica,
+# descends only into subtrees whose hashes differ, and uploads just those files.
+#
+#   python catalog_sync.py tree                      # print root and category hashes
+#   python catalog_sync.py sync /srv/ai-library      # local (or mounted) directory
+#   python catalog_sync.py sync root@VPS_IP:/var/www/ai-tools-directory/dist/public
+#
+# Uploads go to "<path>.<hash>.part" and are appended to in chunks, so an
+# interrupted sync resumes where it stopped; finished files are journalled on
+# the replica so a rerun does not send them again.
+
+PUBLIC_DIR = 'client/public'
+CATALOG_NAME = 'mindmap_data.json'
+SYNC_DIR = '.sync'
+SHARD_DIR = f'{SYNC_DIR}/catalog'
+MANIFEST_PATH = f'{SYNC_DIR}/manifest.json'
+JOURNAL_PATH = f'{SYNC_DIR}/journal'
+CHUNK_SIZE = 256 * 1024
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def dumps(value):
+    # Same formatting the add_*.py scripts use when they write the catalogue.
+    return json.dumps(value, indent=2).encode()
+
+
+def catalog_shards(data):
+    # Skeleton keeps every key in its original order with each subcategory
+    # replaced by a {"$shard": path} reference, so reassembly is byte-exact.
+    shards = {}
+    categories = []
+    for cat in data['categories']:
+        refs = []
+        for sub in cat.get('subcategories', []):
+            ref = f"{cat['id']}/{sub['id']}.json"
+            shards[f'{SHARD_DIR}/{ref}'] = dumps(sub)
+            refs.append({'$shard': ref})
+        categories.append({k: (refs if k == 'subcategories' else v) for k, v in cat.items()})
+    skeleton = {k: (categories if k == 'categories' else v) for k, v in data.items()}
+    shards[f'{SHARD_DIR}/skeleton.json'] = dumps(skeleton)
+    return shards
+
+
+def assemble_catalog(root):
+    # Runs on the replica (in-process for directories, over ssh otherwise), so
+    # it must not depend on anything else in this module.
+    import hashlib
+    import json
+    import os
+
+    base = os.path.join(root, '.sync', 'catalog')
+    with open(os.path.join(base, 'skeleton.json'), 'r') as f:
+        data = json.load(f)
+    for cat in data['categories']:
+        subs = []
+        for ref in cat.get('subcategories', []):
+            with open(os.path.join(base, ref['$shard']), 'r') as f:
+                subs.append(json.load(f))
+        cat['subcategories'] = subs
+    out = json.dumps(data, indent=2).encode()
+    target = os.path.join(root, 'mindmap_data.json')
+    with open(target + '.tmp', 'wb') as f:
+        f.write(out)
+    os.replace(target + '.tmp', target)
+    return hashlib.sha256(out).hexdigest()
+
+
+def local_payloads(public_dir):
+    # path -> (hash, size, loader). The catalogue file is a derived leaf: the
+    # replica rebuilds it from shards instead of receiving it whole.
+    payloads = {}
+    for dirpath, dirnames, filenames in os.walk(public_dir):
+        dirnames[:] = sorted(d for d in dirnames if d != SYNC_DIR)
+        for name in sorted(filenames):
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, public_dir).replace(os.sep, '/')
+            with open(full, 'rb') as f:
+                data = f.read()
+            payloads[rel] = (sha256(data), len(data), lambda full=full: open(full, 'rb').read())
+    catalog_path = os.path.join(public_dir, CATALOG_NAME)
+    if os.path.exists(catalog_path):
+        for rel, data in catalog_shards(load_catalog(catalog_path)).items():
+            payloads[rel] = (sha256(data), len(data), lambda data=data: data)
+    return payloads
+
+
+def build_tree(leaves):
+    # leaves: path -> {"hash", "size"}. Directory hashes cover their children's
+    # names and hashes, so equal hashes mean an identical subtree.
+    root = {'children': {}}
+    for path, leaf in leaves.items():
+        node = root
+        parts = path.split('/')
+        for part in parts[:-1]:
+            node = node['children'].setdefault(part, {'children': {}})
+        node['children'][parts[-1]] = {'hash': leaf['hash'], 'size': leaf['size']}
+
+    def seal(node):
+        if 'children' not in node:
+            return node['hash']
+        lines = ''.join(f'{name}:{seal(child)}\n' for name, child in sorted(node['children'].items()))
+        node['hash'] = sha256(lines.encode())
+        return node['hash']
+
+    seal(root)
+    return root
+
+
+def tree_leaves(node, prefix=''):
+    if 'children' not in node:
+        return {prefix: {'hash': node['hash'], 'size': node['size']}}
+    leaves = {}
+    for name, child in node['children'].items():
+        leaves.update(tree_leaves(child, f'{prefix}/{name}' if prefix else name))
+    return leaves
+
+
+def diff_trees(local, remote, prefix=''):
+    # Returns (changed, deleted) leaf paths, skipping subtrees with equal hashes.
+    if remote is not None and local['hash'] == remote['hash']:
+        return [], []
+    if 'children' not in local:
+        deleted = list(tree_leaves(remote, prefix)) if remote and 'children' in remote else []
+        return [prefix], deleted
+    remote_children = remote.get('children', {}) if remote else {}
+    changed, deleted = [], []
+    if remote and 'children' not in remote:
+        deleted.append(prefix)
+    for name, child in local['children'].items():
+        c, d = diff_trees(child, remote_children.get(name), f'{prefix}/{name}' if prefix else name)
+        changed += c
+        deleted += d
+    for name, child in remote_children.items():
+        if name not in local['children']:
+            deleted += list(tree_leaves(child, f'{prefix}/{name}' if prefix else name))
+    return changed, deleted
+
+
+class DirectoryRemote:
+    # A replica reachable as a local path (a mount, or the test stand-in).
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, path):
+        return os.path.join(self.root, *path.split('/'))
+
+    def read(self, path):
+        try:
+            with open(self._path(path), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def size(self, path):
+        try:
+            return os.path.getsize(self._path(path))
+        except FileNotFoundError:
+            return None
+
+    def append(self, path, data):
+        full = self._path(path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'ab') as f:
+            f.write(data)
+
+    def rename(self, src, dst):
+        os.replace(self._path(src), self._path(dst))
+
+    def delete(self, path):
+        try:
+            os.remove(self._path(path))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, path):
+        # Remove a directory if it is (now) empty.
+        try:
+            os.rmdir(self._path(path))
+        except OSError:
+            pass
+
+    def assemble(self):
+        return assemble_catalog(self.root)
+
+
+class SSHRemote:
+    # A replica reached with plain ssh, as set up in DEPLOY_HOSTINGER_VPS.md.
+
+    def __init__(self, host, root):
+        self.host = host
+        self.root = root
+
+    def _path(self, path):
+        return shlex.quote(f'{self.root.rstrip("/")}/{path}')
+
+    def _run(self, command, data=None, check=True):
+        return subprocess.run(['ssh', self.host, command], input=data, capture_output=True, check=check)
+
+    def read(self, path):
+        result = self._run(f'cat {self._path(path)}', check=False)
+        return result.stdout if result.returncode == 0 else None
+
+    def size(self, path):
+        result = self._run(f'stat -c %s {self._path(path)}', check=False)
+        return int(result.stdout) if result.returncode == 0 else None
+
+    def append(self, path, data):
+        target = self._path(path)
+        self._run(f'mkdir -p "$(dirname {target})" && cat >> {target}', data=data)
+
+    def rename(self, src, dst):
+        self._run(f'mv {self._path(src)} {self._path(dst)}')
+
+    def delete(self, path):
+        self._run(f'rm -f {self._path(path)}')
+
+    def prune(self, path):
+        self._run(f'rmdir {self._path(path)} 2>/dev/null || true')
+
+    def assemble(self):
+        script = inspect.getsource(assemble_catalog) + '\nimport sys\nprint(assemble_catalog(sys.argv[1]))\n'
+        result = self._run(f'python3 - {shlex.quote(self.root)}', data=script.encode())
+        return result.stdout.decode().strip()
+
+
+def open_remote(spec):
+    # "user@host:/path" is ssh; anything else is a directory.
+    host, sep, path = spec.partition(':')
+    if sep and len(host) > 1 and '/' not in host and not os.path.exists(spec):
+        return SSHRemote(host, path)
+    return DirectoryRemote(spec)
+
+
+def remote_tree(remote):
+    # The replica's last manifest plus any files journalled since it was written.
+    raw = remote.read(MANIFEST_PATH)
+    leaves = tree_leaves(json.loads(raw)['tree']) if raw else {}
+    journal = remote.read(JOURNAL_PATH)
+    if journal:
+        for line in journal.decode().splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get('deleted'):
+                leaves.pop(entry['path'], None)
+            else:
+                leaves[entry['path']] = {'hash': entry['hash'], 'size': entry['size']}
+    return build_tree(leaves) if leaves else None
+
+
+class SyncStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = 0
+        self.bytes_sent = 0
+        self.bytes_resumed = 0
+        self.overhead_bytes = 0
+        self.deleted = 0
+
+    def add(self, field, amount):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+
+def upload(remote, path, digest, data, stats):
+    part = f'{path}.{digest[:16]}.part'
+    offset = remote.size(part) or 0
+    if offset > len(data):
+        remote.delete(part)
+        offset = 0
+    stats.add('bytes_resumed', offset)
+    for start in range(offset, len(data), CHUNK_SIZE):
+        chunk = data[start:start + CHUNK_SIZE]
+        remote.append(part, chunk)
+        stats.add('bytes_sent', len(chunk))
+    if not data:
+        remote.append(part, b'')
+    remote.rename(part, path)
+    stats.add('files', 1)
+
+
+def journal(remote, lock, stats, entry):
+    line = (json.dumps(entry) + '\n').encode()
+    with lock:
+        remote.append(JOURNAL_PATH, line)
+    stats.add('overhead_bytes', len(line))
+
+
+def type_changes(changed, deleted):
+    # Deletions that must happen before uploads: a remote file standing where
+    # a local directory now is, or remote files inside a directory that is
+    # now a local file. Also returns the directories to prune afterwards.
+    changed_set = set(changed)
+    changed_dirs = {path.rsplit('/', i)[0] for path in changed for i in range(1, path.count('/') + 1)}
+    first, prune = [], set()
+    for path in deleted:
+        if path in changed_dirs:
+            first.append(path)
+            continue
+        parts = path.split('/')
+        for i in range(1, len(parts)):
+            ancestor = '/'.join(parts[:i])
+            if ancestor in changed_set:
+                first.append(path)
+                prune.update('/'.join(parts[:j]) for j in range(i, len(parts)))
+                break
+    # Deepest directories first so each is empty by the time it is pruned.
+    return first, sorted(prune, key=lambda p: p.count('/'), reverse=True)
+
+
+def sync(public_dir, remote, jobs=8, dry_run=False):
+    payloads = local_payloads(public_dir)
+    local = build_tree({p: {'hash': h, 'size': s} for p, (h, s, _) in payloads.items()})
+    changed, deleted = diff_trees(local, remote_tree(remote))
+    stats = SyncStats()
+    if dry_run or (not changed and not deleted and remote.size(JOURNAL_PATH) is None):
+        return changed, deleted, stats
+
+    journal_lock = threading.Lock()
+    uploads = [p for p in changed if p != CATALOG_NAME]
+
+    def remove(path):
+        remote.delete(path)
+        journal(remote, journal_lock, stats, {'path': path, 'deleted': True})
+        stats.add('deleted', 1)
+
+    # Clear paths whose type changed before anything is uploaded over them.
+    first, prune = type_changes(changed, deleted)
+    for path in first:
+        remove(path)
+    for path in prune:
+        remote.prune(path)
+
+    def send(path):
+        digest, size, load = payloads[path]
+        upload(remote, path, digest, load(), stats)
+        journal(remote, journal_lock, stats, {'path': path, 'hash': digest, 'size': size})
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(send, uploads))
+
+    if CATALOG_NAME in changed:
+        digest, size, load = payloads[CATALOG_NAME]
+        if remote.assemble() != digest:
+            # Reassembly only matches if the file was written with indent=2;
+            # otherwise fall back to sending it whole.
+            upload(remote, CATALOG_NAME, digest, load(), stats)
+        journal(remote, journal_lock, stats, {'path': CATALOG_NAME, 'hash': digest, 'size': size})
+
+    cleared = set(first)
+    for path in deleted:
+        if path not in cleared:
+            remove(path)
+
+    manifest = json.dumps({'root': local['hash'], 'tree': local}, separators=(',', ':')).encode()
+    tmp = MANIFEST_PATH + '.tmp'
+    remote.delete(tmp)
+    remote.append(tmp, manifest)
+    remote.rename(tmp, MANIFEST_PATH)
+    remote.delete(JOURNAL_PATH)
+    stats.add('overhead_bytes', len(manifest))
+    return changed, deleted, stats
+
+
+def cmd_tree(args):
+    payloads = local_payloads(args.public)
+    tree = build_tree({p: {'hash': h, 'size': s} for p, (h, s, _) in payloads.items()})
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'root': tree['hash'], 'tree': tree}, f, indent=2)
+    print(f"root  {tree['hash']}")
+    shards = tree['children'].get(SYNC_DIR, {}).get('children', {}).get('catalog', {}).get('children', {})
+    for name, node in sorted(shards.items()):
+        print(f"{node['hash'][:16]}  {name}")
+    return 0
+
+
+def cmd_sync(args):
+    remote = open_remote(args.remote)
+    changed, deleted, stats = sync(args.public, remote, jobs=args.jobs, dry_run=args.dry_run)
+    for path in changed:
+        print(f'{"Would send" if args.dry_run else "Sent"}: {path}')
+    for path in deleted:
+        print(f'{"Would delete" if args.dry_run else "Deleted"}: {path}')
+    if not args.dry_run:
+        print(f'\n{stats.files} files, {stats.bytes_sent} bytes sent '
+              f'({stats.bytes_resumed} resumed, {stats.overhead_bytes} manifest/journal), '
+              f'{stats.deleted} deleted')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merkle-hashed delta sync of client/public to replicas.')
+    parser.add_argument('--public', default=PUBLIC_DIR, help='directory to snapshot')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    tree = commands.add_parser('tree', help='print (and optionally write) the local Merkle tree')
+    tree.add_argument('--output', help='write the manifest JSON here')
+    tree.set_defaults(func=cmd_tree)
+
+    sync_cmd = commands.add_parser('sync', help='send only what differs from the replica')
+    sync_cmd.add_argument('remote', help='directory or user@host:/path')
+    sync_cmd.add_argument('--jobs', type=int, default=8, help='parallel transfers')
+    sync_cmd.add_argument('--dry-run', action='store_true', help='list changes without sending')
+    sync_cmd.set_defaults(func=cmd_sync)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
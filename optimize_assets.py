@@ -0,0 +1,299 @@
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Builds responsive variants of the heavy static assets in client/public and
+# writes a manifest the client can use to pick the smallest suitable file.
+# Runs in `bun run build` before Vite; the output in client/public/optimized is
+# git-ignored.
+#
+#   python optimize_assets.py            # only re-process changed inputs
+#   python optimize_assets.py --force    # rebuild everything
+#
+# Needs Pillow for images (AVIF needs Pillow >= 11.3 or pillow-avif-plugin)
+# and ffmpeg/ffprobe on PATH for the video poster and metadata. Whatever is
+# missing is skipped with a warning, its previous manifest entry is kept, and
+# the rest still runs.
+
+PUBLIC_DIR = 'client/public'
+OUTPUT_DIR = 'client/public/optimized'
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, 'manifest.json')
+
+IMAGES = ['world-tree.png']
+VIDEOS = ['world-treevideo.mp4']
+
+WIDTHS = [480, 768, 1280, 1920]
+FORMATS = [
+    # (format, extension, mime type, save options)
+    ('AVIF', 'avif', 'image/avif', {'quality': 50}),
+    ('WEBP', 'webp', 'image/webp', {'quality': 75, 'method': 6}),
+]
+PLACEHOLDER_WIDTH = 24
+POSTER_WIDTHS = [768, 1280]
+
+# Bump when the variant settings above change so cached entries are rebuilt.
+# The formats the local Pillow can write are part of the cache key too, so
+# installing AVIF support rebuilds the images.
+PIPELINE_VERSION = 1
+
+
+def file_hash(path, formats=()):
+    digest = hashlib.sha256(f"v{PIPELINE_VERSION}:{','.join(formats)}:".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def public_url(path):
+    return '/' + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, '/')
+
+
+def target_widths(source_width, widths):
+    # Never upscale; the source width itself is always offered as the largest.
+    return sorted({w for w in widths if w < source_width} | {source_width})
+
+
+def open_image(path):
+    from PIL import Image
+
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def resized(img, width):
+    from PIL import Image
+
+    if width == img.width:
+        return img
+    height = max(1, round(img.height * width / img.width))
+    return img.resize((width, height), Image.LANCZOS)
+
+
+def fallback_format(img):
+    # JPEG is far smaller for photographic art, but cannot carry alpha.
+    if img.mode in ('RGBA', 'LA') or 'transparency' in img.info:
+        return ('PNG', 'png', 'image/png', {'optimize': True})
+    return ('JPEG', 'jpg', 'image/jpeg', {'quality': 80, 'optimize': True, 'progressive': True})
+
+
+def render_variant(job):
+    # Runs in a worker process, so everything it needs travels in `job`.
+    source, width, fmt, ext, mime, options, out_path = job
+    img = resized(open_image(source), width)
+    if fmt == 'JPEG' and img.mode != 'RGB':
+        img = img.convert('RGB')
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(buf.getvalue())
+    os.replace(tmp_path, out_path)
+    return {
+        'src': public_url(out_path),
+        'type': mime,
+        'width': img.width,
+        'height': img.height,
+        'bytes': len(buf.getvalue()),
+    }
+
+
+def render_placeholder(source):
+    img = resized(open_image(source), PLACEHOLDER_WIDTH).convert('RGB')
+    buf = io.BytesIO()
+    img.save(buf, 'WEBP', quality=30)
+    return 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode()
+
+
+def image_jobs(name, source, img, supported):
+    stem = os.path.splitext(name)[0]
+    formats = [f for f in FORMATS if f[0] in supported] + [fallback_format(img)]
+    jobs = []
+    for fmt, ext, mime, options in formats:
+        for width in target_widths(img.width, WIDTHS):
+            out_path = os.path.join(OUTPUT_DIR, f'{stem}-{width}.{ext}')
+            jobs.append((source, width, fmt, ext, mime, options, out_path))
+    return jobs
+
+
+def format_supported(fmt):
+    # AVIF may come from Pillow itself or from pillow-avif-plugin.
+    from PIL import Image
+
+    if fmt == 'AVIF':
+        try:
+            import pillow_avif  # noqa: F401
+        except ImportError:
+            pass
+    Image.init()
+    return fmt in Image.SAVE
+
+
+def group_sources(variants):
+    # <picture> order: best compression first, fallback last.
+    sources = {}
+    for v in variants:
+        sources.setdefault(v['type'], []).append(v)
+    order = [mime for _, _, mime, _ in FORMATS]
+    groups = []
+    for mime in sorted(sources, key=lambda m: order.index(m) if m in order else len(order)):
+        entries = sorted(sources[mime], key=lambda v: v['width'])
+        groups.append({
+            'type': mime,
+            'srcset': ', '.join(f"{v['src']} {v['width']}w" for v in entries),
+            'variants': entries,
+        })
+    return groups
+
+
+def ffprobe(source, entries):
+    out = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', entries, '-of', 'json', source],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out)
+
+
+def probe_video(source):
+    info = ffprobe(source, 'stream=width,height,codec_name:format=duration')
+    stream = info['streams'][0]
+    return {
+        'width': stream['width'],
+        'height': stream['height'],
+        'codec': stream.get('codec_name'),
+        'duration': round(float(info['format']['duration']), 2),
+    }
+
+
+def render_poster(job):
+    source, width, out_path = job
+    tmp_path = out_path + '.tmp.jpg'
+    subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-ss', '0', '-i', source,
+         '-frames:v', '1', '-vf', f'scale={width}:-2', '-q:v', '4', tmp_path],
+        check=True,
+    )
+    os.replace(tmp_path, out_path)
+    # Read the size back: ffmpeg rounds the scaled height to an even number.
+    stream = ffprobe(out_path, 'stream=width,height')['streams'][0]
+    return {'src': public_url(out_path), 'type': 'image/jpeg', 'width': stream['width'],
+            'height': stream['height'], 'bytes': os.path.getsize(out_path)}
+
+
+def outputs_exist(entry):
+    paths = [v['src'] for group in entry.get('sources', []) for v in group['variants']]
+    paths += [p['src'] for p in entry.get('posters', [])]
+    return all(os.path.exists(os.path.join(PUBLIC_DIR, p.lstrip('/'))) for p in paths)
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {'images': {}, 'videos': {}}
+    with open(MANIFEST_PATH, 'r') as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Optimize heavy static assets in client/public.')
+    parser.add_argument('--force', action='store_true', help='rebuild even if inputs are unchanged')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size')
+    args = parser.parse_args(argv)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    previous = load_manifest()
+    manifest = {'images': {}, 'videos': {}}
+
+    try:
+        supported = [fmt for fmt, _, _, _ in FORMATS if format_supported(fmt)]
+    except ImportError:
+        supported = None
+
+    image_work = {}
+    for name in IMAGES:
+        source = os.path.join(PUBLIC_DIR, name)
+        cached = previous.get('images', {}).get(name)
+        if supported is None:
+            if cached:
+                manifest['images'][name] = cached
+            print(f'Skipped: {name} (Pillow is required for image variants: pip install Pillow)',
+                  file=sys.stderr)
+            continue
+        digest = file_hash(source, supported)
+        if not args.force and cached and cached.get('hash') == digest and outputs_exist(cached):
+            manifest['images'][name] = cached
+            print(f'Unchanged: {name}')
+            continue
+        img = open_image(source)
+        manifest['images'][name] = {
+            'hash': digest,
+            'src': public_url(source),
+            'width': img.width,
+            'height': img.height,
+            'bytes': os.path.getsize(source),
+            'placeholder': render_placeholder(source),
+        }
+        image_work[name] = image_jobs(name, source, img, supported)
+
+    video_work = {}
+    for name in VIDEOS:
+        source = os.path.join(PUBLIC_DIR, name)
+        digest = file_hash(source)
+        cached = previous.get('videos', {}).get(name)
+        if not args.force and cached and cached.get('hash') == digest and outputs_exist(cached):
+            manifest['videos'][name] = cached
+            print(f'Unchanged: {name}')
+            continue
+        if not shutil.which('ffmpeg') or not shutil.which('ffprobe'):
+            # Images are still worth shipping; keep whatever we had for the video.
+            if cached:
+                manifest['videos'][name] = cached
+            print(f'Skipped: {name} (ffmpeg and ffprobe are required for video posters)', file=sys.stderr)
+            continue
+        meta = probe_video(source)
+        stem = os.path.splitext(name)[0]
+        manifest['videos'][name] = {
+            'hash': digest,
+            'src': public_url(source),
+            'type': 'video/mp4',
+            'bytes': os.path.getsize(source),
+            **meta,
+        }
+        video_work[name] = [
+            (source, w, os.path.join(OUTPUT_DIR, f'{stem}-poster-{w}.jpg'))
+            for w in target_widths(meta['width'], POSTER_WIDTHS)
+        ]
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        image_results = {name: pool.map(render_variant, jobs) for name, jobs in image_work.items()}
+        video_results = {name: pool.map(render_poster, jobs) for name, jobs in video_work.items()}
+
+        for name, results in image_results.items():
+            variants = list(results)
+            manifest['images'][name]['sources'] = group_sources(variants)
+            smallest = min(v['bytes'] for v in variants)
+            print(f'Optimized: {name} ({len(variants)} variants, smallest {smallest} bytes)')
+
+        for name, results in video_results.items():
+            posters = list(results)
+            manifest['videos'][name]['posters'] = posters
+            manifest['videos'][name]['poster'] = posters[-1]['src'] if posters else None
+            print(f'Optimized: {name} ({len(posters)} posters)')
+
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+    print(f'\nManifest written to {MANIFEST_PATH}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+import argparse
+import datetime
+import hashlib
+import html
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from catalog import CATALOG_PATH, load_catalog, tool_keys, tool_slugs
+
+# Pre-renders a lightweight static page for every category and tool in the
+# catalogue, with the entries rendered straight into the HTML so first paint
+# needs no catalogue fetch, and writes a sharded sitemap index covering them.
+# Runs in `bun run build` before Vite.
+#
+#   python prerender.py            # re-render only pages whose entries changed
+#   python prerender.py --force    # re-render everything
+#
+# Output lands in client/public (git-ignored) so Vite ships it with the SPA:
+#   /category/<category-id>/index.html
+#   /tool/<tool-slug>/index.html
+#   /sitemap.xml (index) -> /sitemaps/sitemap-<n>.xml
+# Page hashes and lastmod dates are kept in .prerender-state.json at the repo
+# root, outside the published directory. Tool pages also record which tool they
+# belong to, so a tool keeps its slug when another with the same name is added
+# ahead of it; catalog_server.py reads the same file for its tool ids.
+
+SITE_URL = 'https://aitreelibrary.com'
+PUBLIC_DIR = 'client/public'
+STATE_PATH = '.prerender-state.json'
+SITEMAP_SHARD_SIZE = 5000  # protocol limit is 50,000 URLs per file
+
+# Pages the SPA serves itself; listed so the sitemap stays complete.
+STATIC_PAGES = [
+    ('/', 'weekly', '1.0'),
+    ('/admin', 'monthly', '0.3'),
+]
+
+# Bump when the templates below change so every page is re-rendered.
+TEMPLATE_VERSION = 2
+
+STYLE = (
+    'body{margin:0;background:#030308;color:#e2e8f0;font:16px/1.5 Inter,system-ui,sans-serif}'
+    'main{max-width:960px;margin:0 auto;padding:32px 20px}'
+    'a{color:#a78bfa}h1{font-family:"Space Grotesk",Inter,sans-serif;margin:.2em 0}'
+    'ul{list-style:none;padding:0}li{margin:10px 0}'
+    '.muted{color:#94a3b8}.tag{font-size:12px;border:1px solid #334155;border-radius:9px;padding:1px 8px;margin-left:6px}'
+)
+
+
+def tool_data(tool):
+    return {
+        'name': tool['name'],
+        'url': tool['url'],
+        'description': tool['description'],
+        'pricing': tool['pricing'],
+        'gem': bool(tool.get('gem') or tool.get('isGem')),
+        'featured': bool(tool.get('featured')),
+    }
+
+
+def plan_pages(data, slugs):
+    # Returns {path: (kind, payload)}; payload is everything the page shows,
+    # so its hash decides whether the page needs re-rendering.
+    pages = {}
+    tool_paths = {key: f'/tool/{slug}/' for key, slug in slugs.items()}
+
+    for cat in data['categories']:
+        subcategories = []
+        for sub in cat.get('subcategories', []):
+            tools = []
+            for i, tool in enumerate(sub.get('tools', [])):
+                path = tool_paths[(cat['id'], sub['id'], i)]
+                tools.append({**tool_data(tool), 'path': path})
+                pages[path] = ('tool', {
+                    'tool': tool_data(tool),
+                    'category': {'id': cat['id'], 'name': cat['name'], 'icon': cat.get('icon', '')},
+                    'subcategory': {'id': sub['id'], 'name': sub['name']},
+                    'related': [
+                        {'name': t['name'], 'path': tool_paths[(cat['id'], sub['id'], j)]}
+                        for j, t in enumerate(sub.get('tools', [])) if j != i
+                    ][:8],
+                })
+            subcategories.append({'id': sub['id'], 'name': sub['name'], 'tools': tools})
+        pages[f"/category/{cat['id']}/"] = ('category', {
+            'category': {'id': cat['id'], 'name': cat['name'], 'icon': cat.get('icon', ''),
+                         'color': cat.get('color', '')},
+            'subcategories': subcategories,
+        })
+    return pages
+
+
+def page_hash(kind, payload):
+    text = json.dumps([TEMPLATE_VERSION, kind, payload], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def page_shell(title, description, path, body):
+    e = html.escape
+    return (
+        '<!doctype html>\n<html lang="en">\n<head>\n'
+        '<meta charset="UTF-8" />\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0" />\n'
+        f'<title>{e(title)} | AI Tree Library</title>\n'
+        f'<meta name="description" content="{e(description)}" />\n'
+        f'<link rel="canonical" href="{e(SITE_URL + path)}" />\n'
+        f'<meta property="og:title" content="{e(title)}" />\n'
+        f'<meta property="og:description" content="{e(description)}" />\n'
+        f'<meta property="og:url" content="{e(SITE_URL + path)}" />\n'
+        '<link rel="icon" type="image/svg+xml" href="/favicon.svg" />\n'
+        f'<style>{STYLE}</style>\n'
+        '</head>\n<body>\n<main>\n'
+        '<p><a href="/">AI Tree Library</a></p>\n'
+        f'{body}'
+        '</main>\n</body>\n</html>\n'
+    )
+
+
+def tool_item(tool, href):
+    e = html.escape
+    tags = ''.join(f'<span class="tag">{label}</span>'
+                   for label, on in (('Hidden gem', tool['gem']), ('Featured', tool['featured'])) if on)
+    return (f'<li><a href="{e(href)}">{e(tool["name"])}</a>{tags}'
+            f'<br><span class="muted">{e(tool["description"])} &middot; {e(tool["pricing"])}</span></li>\n')
+
+
+def render_category(path, payload):
+    e = html.escape
+    cat = payload['category']
+    count = sum(len(sub['tools']) for sub in payload['subcategories'])
+    body = f'<h1>{e(cat["icon"])} {e(cat["name"])}</h1>\n<p class="muted">{count} AI tools</p>\n'
+    for sub in payload['subcategories']:
+        body += f'<h2 id="{e(sub["id"])}">{e(sub["name"])}</h2>\n<ul>\n'
+        body += ''.join(tool_item(tool, tool['path']) for tool in sub['tools'])
+        body += '</ul>\n'
+    names = ', '.join(t['name'] for sub in payload['subcategories'] for t in sub['tools'][:3])
+    description = f'{count} curated {cat["name"]} AI tools, including {names}.'
+    return page_shell(f'{cat["name"]} AI Tools', description, path, body)
+
+
+def render_tool(path, payload):
+    e = html.escape
+    tool, cat, sub = payload['tool'], payload['category'], payload['subcategory']
+    body = (
+        f'<p class="muted"><a href="/category/{e(cat["id"])}/">{e(cat["icon"])} {e(cat["name"])}</a>'
+        f' &rsaquo; <a href="/category/{e(cat["id"])}/#{e(sub["id"])}">{e(sub["name"])}</a></p>\n'
+        f'<h1>{e(tool["name"])}</h1>\n'
+        f'<p>{e(tool["description"])}</p>\n'
+        f'<p class="muted">Pricing: {e(tool["pricing"])}</p>\n'
+        f'<p><a href="{e(tool["url"])}" rel="noopener" target="_blank">Visit {e(tool["name"])}</a></p>\n'
+    )
+    if payload['related']:
+        body += f'<h2>More {e(sub["name"])}</h2>\n<ul>\n'
+        body += ''.join(f'<li><a href="{e(r["path"])}">{e(r["name"])}</a></li>\n' for r in payload['related'])
+        body += '</ul>\n'
+    return page_shell(f'{tool["name"]} - {sub["name"]}', tool['description'], path, body)
+
+
+def render_page(job):
+    # Runs in a worker process.
+    path, kind, payload, public_dir = job
+    render = render_category if kind == 'category' else render_tool
+    out_dir = os.path.join(public_dir, *path.strip('/').split('/'))
+    os.makedirs(out_dir, exist_ok=True)
+    target = os.path.join(out_dir, 'index.html')
+    with open(target + '.tmp', 'w') as f:
+        f.write(render(path, payload))
+    os.replace(target + '.tmp', target)
+    return path
+
+
+def remove_page(public_dir, path):
+    out_dir = os.path.join(public_dir, *path.strip('/').split('/'))
+    shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def write_sitemaps(entries, public_dir=PUBLIC_DIR):
+    # entries: iterable of (path, lastmod, changefreq, priority). Shards are
+    # streamed to disk as they fill, so memory does not grow with page count.
+    sitemap_dir = os.path.join(public_dir, 'sitemaps')
+    os.makedirs(sitemap_dir, exist_ok=True)
+    for name in os.listdir(sitemap_dir):
+        if name.startswith('sitemap-') and name.endswith('.xml'):
+            os.remove(os.path.join(sitemap_dir, name))
+
+    shards = []
+    f = None
+    count = 0
+    shard_lastmod = ''
+    for path, lastmod, changefreq, priority in entries:
+        if f is None or count == SITEMAP_SHARD_SIZE:
+            if f is not None:
+                f.write('</urlset>\n')
+                f.close()
+                shards[-1] = (shards[-1][0], shard_lastmod)
+            name = f'sitemap-{len(shards) + 1}.xml'
+            shards.append((name, ''))
+            f = open(os.path.join(sitemap_dir, name), 'w')
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+            count = 0
+            shard_lastmod = ''
+        loc = SITE_URL if path == '/' else SITE_URL + path
+        f.write(f'  <url>\n    <loc>{html.escape(loc)}</loc>\n'
+                f'    <lastmod>{lastmod}</lastmod>\n'
+                f'    <changefreq>{changefreq}</changefreq>\n'
+                f'    <priority>{priority}</priority>\n  </url>\n')
+        count += 1
+        shard_lastmod = max(shard_lastmod, lastmod)
+    if f is not None:
+        f.write('</urlset>\n')
+        f.close()
+        shards[-1] = (shards[-1][0], shard_lastmod)
+
+    with open(os.path.join(public_dir, 'sitemap.xml'), 'w') as index:
+        index.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for name, lastmod in shards:
+            index.write(f'  <sitemap>\n    <loc>{SITE_URL}/sitemaps/{name}</loc>\n'
+                        f'    <lastmod>{lastmod}</lastmod>\n  </sitemap>\n')
+        index.write('</sitemapindex>\n')
+    return len(shards)
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def previous_slugs(state):
+    # {tool key: slug} for the tool pages of an earlier run.
+    return {entry['key']: path.strip('/').split('/')[-1]
+            for path, entry in state.items() if 'key' in entry}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-render category and tool pages and the sitemap.')
+    parser.add_argument('--catalog', default=CATALOG_PATH, help='catalogue JSON to read')
+    parser.add_argument('--public', default=PUBLIC_DIR, help='directory to write pages into')
+    parser.add_argument('--state', default=STATE_PATH, help='page hash and lastmod state file')
+    parser.add_argument('--force', action='store_true', help='re-render every page')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size')
+    args = parser.parse_args(argv)
+
+    today = datetime.date.today().isoformat()
+    state_path = args.state
+    previous = load_state(state_path)
+    data = load_catalog(args.catalog)
+    slugs = tool_slugs(data, previous_slugs(previous))
+    pages = plan_pages(data, slugs)
+    keys = {f'/tool/{slugs[pos]}/': key for pos, key in tool_keys(data).items()}
+
+    state = {}
+    jobs = []
+    for path, (kind, payload) in pages.items():
+        digest = page_hash(kind, payload)
+        old = previous.get(path)
+        rendered = os.path.exists(os.path.join(args.public, *path.strip('/').split('/'), 'index.html'))
+        key = {'key': keys[path]} if path in keys else {}
+        if not args.force and old and old['hash'] == digest and rendered:
+            state[path] = {'hash': old['hash'], 'lastmod': old['lastmod'], **key}
+            continue
+        # Forced re-renders of unchanged content keep their lastmod.
+        changed = not old or old['hash'] != digest
+        state[path] = {'hash': digest, 'lastmod': today if changed else old['lastmod'], **key}
+        jobs.append((path, kind, payload, args.public))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for _ in pool.map(render_page, jobs, chunksize=32):
+                pass
+
+    # Pages the state knows about, plus any leftover directory on disk, so a
+    # lost or reset state file cannot leave deleted pages in the build.
+    removed = {path for path in previous if path not in pages}
+    for kind in ('category', 'tool'):
+        kind_dir = os.path.join(args.public, kind)
+        if os.path.isdir(kind_dir):
+            removed.update(f'/{kind}/{name}/' for name in os.listdir(kind_dir)
+                           if f'/{kind}/{name}/' not in pages)
+    for path in sorted(removed):
+        remove_page(args.public, path)
+
+    site_lastmod = max((s['lastmod'] for s in state.values()), default=today)
+    entries = [(path, site_lastmod, freq, prio) for path, freq, prio in STATIC_PAGES]
+    entries += [(path, s['lastmod'], 'weekly', '0.8' if path.startswith('/category/') else '0.6')
+                for path, s in sorted(state.items())]
+    shard_count = write_sitemaps(iter(entries), args.public)
+
+    with open(state_path + '.tmp', 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(state_path + '.tmp', state_path)
+
+    print(f'Rendered: {len(jobs)} pages ({len(pages) - len(jobs)} unchanged, {len(removed)} removed)')
+    print(f'Sitemap: {len(entries)} URLs in {shard_count} shards')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import json
+
+from catalog import check_batch, main, tool_keys, tool_slugs
+
+
+def make_catalog():
+    return {
+        'name': 'AI LIBRARY',
+        'categories': [
+            {
+                'id': 'audio',
+                'name': 'Audio & Music',
+                'subcategories': [
+                    {'id': 'music-gen', 'name': 'Music Generation', 'tools': [
+                        {'id': 301, 'name': 'Suno', 'url': 'https://suno.ai',
+                         'description': 'AI music generation', 'pricing': 'Free / Paid'},
+                        {'id': 'tool-2', 'name': 'Udio', 'url': 'https://udio.com',
+                         'description': 'AI music creation', 'pricing': 'Free / Paid'},
+                    ]},
+                    {'id': 'voice-speech', 'name': 'Voice & Speech', 'tools': [
+                        {'id': 302, 'name': 'SuperWhisper', 'url': 'https://superwhisper.com',
+                         'description': 'Voice to text', 'pricing': 'Paid'},
+                    ]},
+                ],
+            },
+        ],
+    }
+
+
+def tool(name='New Tool', url='https://newtool.example.com', **extra):
+    return {'name': name, 'url': url, 'description': 'Does things', 'pricing': 'Free',
+            'category': 'audio', 'subcategory': 'music-gen', **extra}
+
+
+def codes(batch):
+    _, report = check_batch(batch, make_catalog())
+    return sorted((i['severity'], i['code']) for i in report.issues)
+
+
+def test_clean_batch_has_no_issues():
+    total, report = check_batch([tool(), tool('Other', 'https://other.example.com', id=400)], make_catalog())
+    assert total == 2
+    assert report.issues == []
+
+
+def test_category_and_subcategory_may_be_names():
+    assert codes([tool(category='Audio & Music', subcategory='Voice & Speech')]) == []
+
+
+def test_schema_errors():
+    assert codes([{'name': 'X', 'category': 'audio', 'subcategory': 'music-gen'}]) == [('error', 'schema')] * 3
+    assert codes([tool(isGem='yes')]) == [('error', 'schema')]
+    assert codes([tool(colour='red')]) == [('warning', 'schema')]
+    assert codes(['not a tool']) == [('error', 'schema')] * 3
+
+
+def test_non_string_routing_is_reported_not_raised():
+    assert codes([tool(category=['x'])]) == [('error', 'schema')]
+    assert codes([tool(subcategory={'id': 1})]) == [('error', 'schema')]
+
+
+def test_unhashable_id_is_reported_not_raised():
+    assert codes([tool(id=[1])]) == [('error', 'schema')]
+
+
+def test_bad_url():
+    assert codes([tool(url='htp://x')]) == [('error', 'url')]
+    assert codes([tool(url='https://has space.com')]) == [('error', 'url')]
+    assert codes([tool(url='https://[::1')]) == [('error', 'url')]
+
+
+def test_unknown_category_and_subcategory():
+    assert codes([tool(category='nope')]) == [('error', 'category')]
+    assert codes([tool(subcategory='nope')]) == [('error', 'subcategory')]
+
+
+def test_duplicates_against_catalogue_and_batch():
+    assert codes([tool('suno', 'https://www.suno.ai/')]) == [('error', 'duplicate'), ('warning', 'duplicate-url')]
+    assert codes([tool(), tool()]) == [('error', 'duplicate'), ('warning', 'duplicate-url')]
+
+
+def test_duplicate_ids_compare_across_schemes():
+    assert codes([tool(id=2)]) == [('error', 'duplicate-id')]
+    assert codes([tool(id='tool-301')]) == [('error', 'duplicate-id'), ('warning', 'id-scheme')]
+    assert codes([tool(id=500), tool('B', 'https://b.example.com', id='tool-500')]) == [
+        ('error', 'duplicate-id'), ('warning', 'id-scheme')]
+
+
+def test_id_scheme_warning():
+    assert codes([tool(id='tool-900')]) == [('warning', 'id-scheme')]
+    assert codes([tool(id='abc')]) == [('warning', 'id-scheme')]
+
+
+def test_destructive_replacement():
+    batch = {'replace': {'audio': [
+        {'id': 'music-gen', 'name': 'Music Generation', 'tools': [{'name': 'Suno'}, {'name': 'Udio'}]},
+    ]}}
+    _, report = check_batch(batch, make_catalog())
+    messages = [i['message'] for i in report.issues if i['code'] == 'destructive']
+    assert any("removes subcategory 'voice-speech'" in m for m in messages)
+    assert any('SuperWhisper' in m for m in messages)
+
+
+def test_unexpected_top_level_keys():
+    batch = {'add': [tool()], 'audio': {'music-gen': [tool('Lost')]}}
+    total, report = check_batch(batch, make_catalog())
+    assert total == 1
+    assert [(i['code'], i['where']) for i in report.issues] == [('schema', 'audio')]
+
+
+def test_nested_batch_shape():
+    assert codes({'audio': {'music-gen': [{k: v for k, v in tool().items()
+                                             if k not in ('category', 'subcategory')}]}}) == []
+
+
+def test_slugs_stick_when_a_same_named_tool_is_added_first():
+    data = make_catalog()
+    data['categories'][0]['subcategories'][1]['tools'].append({'name': 'Suno', 'url': 'https://b.example.com'})
+    before = tool_slugs(data)
+    assert before[('audio', 'music-gen', 0)] == 'suno'
+    assert before[('audio', 'voice-speech', 1)] == 'suno-voice-speech'
+
+    previous = {key: before[pos] for pos, key in tool_keys(data).items()}
+    data['categories'].insert(0, {'id': 'video', 'name': 'Video', 'subcategories': [
+        {'id': 'gen', 'name': 'Generation', 'tools': [{'name': 'Suno', 'url': 'https://c.example.com'}]}]})
+    assert tool_slugs(data)[('audio', 'music-gen', 0)] != 'suno'
+    after = tool_slugs(data, previous)
+    assert after[('audio', 'music-gen', 0)] == 'suno'
+    assert after[('audio', 'voice-speech', 1)] == 'suno-voice-speech'
+    assert after[('video', 'gen', 0)] == 'suno-gen'
+
+
+def test_check_command_exit_codes(tmp_path, capsys):
+    catalog = tmp_path / 'catalog.json'
+    catalog.write_text(json.dumps(make_catalog()))
+    good, bad, warn = tmp_path / 'good.json', tmp_path / 'bad.json', tmp_path / 'warn.json'
+    good.write_text(json.dumps([tool()]))
+    bad.write_text(json.dumps([tool(category=['x'])]))
+    warn.write_text(json.dumps([tool(colour='red')]))
+
+    assert main(['--catalog', str(catalog), 'check', str(good)]) == 0
+    capsys.readouterr()
+    assert main(['--catalog', str(catalog), 'check', str(bad), '--format', 'json']) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report['ok'] is False and report['issues'][0]['code'] == 'schema'
+    assert main(['--catalog', str(catalog), 'check', str(warn)]) == 0
+    assert main(['--catalog', str(catalog), 'check', str(warn), '--strict']) == 1
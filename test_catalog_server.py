@@ -0,0 +1,177 @@
+import asyncio
+import json
+import os
+
+from catalog_server import CatalogService, etag_matches
+
+
+def make_catalog(first='Suno'):
+    return {
+        'name': 'AI LIBRARY',
+        'categories': [
+            {'id': 'audio', 'name': 'Audio & Music', 'subcategories': [
+                {'id': 'music-gen', 'name': 'Music Generation', 'tools': [
+                    {'id': 301, 'name': first, 'url': 'https://suno.ai',
+                     'description': 'AI music generation', 'pricing': 'Free / Paid'},
+                    {'id': 302, 'name': 'Udio', 'url': 'https://udio.com',
+                     'description': 'AI music creation', 'pricing': 'Free'},
+                ]},
+            ]},
+            {'id': 'code', 'name': 'Coding', 'subcategories': [
+                {'id': 'assistants', 'name': 'Assistants', 'tools': [
+                    {'id': 401, 'name': 'Cursor', 'url': 'https://cursor.com',
+                     'description': 'AI code editor', 'pricing': 'Paid', 'gem': True},
+                ]},
+            ]},
+        ],
+    }
+
+
+def make_service(tmp_path, cache_size=2):
+    path = tmp_path / 'catalog.json'
+    path.write_text(json.dumps(make_catalog()))
+    return CatalogService(str(path), cache_size=cache_size)
+
+
+async def exchange(reader, writer, raw):
+    writer.write(raw)
+    await writer.drain()
+    lines = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    status = int(lines[0].split(' ', 2)[1])
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+def over_loopback(service, client):
+    async def run():
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            return await client(reader, writer)
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(run())
+
+
+def test_respond_routes_and_errors(tmp_path):
+    service = make_service(tmp_path)
+    status, body, etag = service.respond('/categories')
+    assert status == 200 and etag
+    assert [c['tools'] for c in json.loads(body)['categories']] == [2, 1]
+    assert service.respond('/tools?gem=true')[0] == 200
+    assert json.loads(service.respond('/search?q=ud')[1])['items'][0]['name'] == 'Udio'
+    assert service.respond('/tools/nope')[0] == 404
+    assert service.respond('/tools?per_page=0')[0] == 400
+
+
+def test_etag_matches():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"x", W/"a"', '"a"')
+    assert etag_matches('*', '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    service = make_service(tmp_path, cache_size=2)
+    first = service.respond('/categories')
+    service.respond('/tools?page=1')
+    service.respond('/categories')  # refresh, so /tools?page=1 is now oldest
+    service.respond('/search?q=cu')
+    cache = service.state[1]
+    assert len(cache) == 2
+    assert list(cache) == [('/categories', ()), ('/search', (('q', 'cu'),))]
+    assert service.respond('/categories') is first
+    # Query order and unused parameters do not split the cache.
+    assert service.respond('/tools?page=1&per_page=5')[2] == service.respond('/tools?per_page=5&page=1')[2]
+    service.respond('/tools?junk=1')
+    service.respond('/tools?junk=2')
+    assert len(service.state[1]) == 2 and ('/tools', ()) in service.state[1]
+
+
+def test_encoded_separators_do_not_share_a_cache_entry(tmp_path):
+    service = make_service(tmp_path)
+    encoded = json.loads(service.respond('/tools?category=code%26gem%3Dtrue')[1])
+    real = json.loads(service.respond('/tools?category=code&gem=true')[1])
+    assert encoded['total'] == 0
+    assert real['total'] == 1 and real['items'][0]['name'] == 'Cursor'
+
+
+def test_if_none_match_gets_304(tmp_path):
+    service = make_service(tmp_path)
+
+    async def client(reader, writer):
+        status, headers, body = await exchange(reader, writer, b'GET /categories HTTP/1.1\r\nHost: x\r\n\r\n')
+        assert status == 200 and headers['etag']
+        revalidate = f'GET /categories HTTP/1.1\r\nHost: x\r\nIf-None-Match: {headers["etag"]}\r\n\r\n'
+        status, headers, body = await exchange(reader, writer, revalidate.encode())
+        assert status == 304 and body == b''
+        status, _, _ = await exchange(reader, writer, b'GET /categories HTTP/1.1\r\nIf-None-Match: "stale"\r\n\r\n')
+        assert status == 200
+
+    over_loopback(service, client)
+
+
+def test_keep_alive_skips_request_body(tmp_path):
+    service = make_service(tmp_path)
+
+    async def client(reader, writer):
+        status, _, _ = await exchange(reader, writer, b'GET /categories HTTP/1.1\r\nContent-Length: 18\r\n\r\n'
+                                                      b'GET /nope HTTP/1.1')
+        assert status == 200
+        status, _, body = await exchange(reader, writer, b'GET /tools/suno HTTP/1.1\r\n\r\n')
+        assert status == 200 and json.loads(body)['name'] == 'Suno'
+        status, _, _ = await exchange(reader, writer, b'POST /tools HTTP/1.1\r\n\r\n')
+        assert status == 405
+
+    over_loopback(service, client)
+
+
+def test_unsupported_body_closes_connection(tmp_path):
+    service = make_service(tmp_path)
+
+    async def client(reader, writer):
+        status, headers, _ = await exchange(reader, writer, b'GET /categories HTTP/1.1\r\n'
+                                                            b'Transfer-Encoding: chunked\r\n\r\n')
+        assert status == 400 and headers['connection'] == 'close'
+        assert await reader.read() == b''
+
+    over_loopback(service, client)
+
+
+def test_rewrite_swaps_in_new_index(tmp_path):
+    service = make_service(tmp_path)
+    old_index, old_cache = service.state
+    old_etag = service.respond('/tools/suno')[2]
+    assert service.respond('/tools/suno-v2')[0] == 404
+
+    async def rewrite():
+        watcher = asyncio.ensure_future(service.watch(interval=0.01))
+        try:
+            with open(service.path, 'w') as f:
+                json.dump(make_catalog('Suno v2'), f)
+            stat = os.stat(service.path)
+            os.utime(service.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            for _ in range(200):
+                if service.state[0] is not old_index:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            watcher.cancel()
+
+    asyncio.run(rewrite())
+    index, cache = service.state
+    assert index.version != old_index.version
+    assert cache is not old_cache and len(cache) == 0
+    assert service.respond('/tools/suno')[0] == 404
+    status, body, etag = service.respond('/tools/suno-v2')
+    assert status == 200 and json.loads(body)['name'] == 'Suno v2'
+    assert etag != old_etag
@@ -0,0 +1,172 @@
+import json
+import os
+
+from catalog_sync import CATALOG_NAME, DirectoryRemote, catalog_shards, sync
+
+
+def make_catalog(categories=12, subcategories=6, tools=20):
+    return {
+        'name': 'AI LIBRARY',
+        'categories': [
+            {
+                'id': f'cat-{c}',
+                'name': f'Category {c}',
+                'icon': '\U0001f916',
+                'subcategories': [
+                    {
+                        'id': f'sub-{s}',
+                        'name': f'Subcategory {s}',
+                        'tools': [
+                            {
+                                'name': f'Tool {c}-{s}-{t}',
+                                'url': f'https://tool-{c}-{s}-{t}.example.com',
+                                'description': 'An AI tool that does something useful for its users.',
+                                'pricing': 'Freemium',
+                            }
+                            for t in range(tools)
+                        ],
+                    }
+                    for s in range(subcategories)
+                ],
+            }
+            for c in range(categories)
+        ],
+        'stats': {'totalTools': categories * subcategories * tools},
+    }
+
+
+def write_public(public, data):
+    os.makedirs(public, exist_ok=True)
+    with open(os.path.join(public, CATALOG_NAME), 'w') as f:
+        json.dump(data, f, indent=2)
+    with open(os.path.join(public, 'robots.txt'), 'w') as f:
+        f.write('User-agent: *\nAllow: /\n')
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_initial_sync_reproduces_public_dir(tmp_path):
+    public, replica = str(tmp_path / 'public'), str(tmp_path / 'replica')
+    write_public(public, make_catalog())
+
+    changed, deleted, stats = sync(public, DirectoryRemote(replica))
+
+    assert CATALOG_NAME in changed and deleted == []
+    assert read(os.path.join(replica, CATALOG_NAME)) == read(os.path.join(public, CATALOG_NAME))
+    assert read(os.path.join(replica, 'robots.txt')) == read(os.path.join(public, 'robots.txt'))
+
+
+def test_unchanged_sync_sends_nothing(tmp_path):
+    public, replica = str(tmp_path / 'public'), str(tmp_path / 'replica')
+    write_public(public, make_catalog())
+    sync(public, DirectoryRemote(replica))
+
+    changed, deleted, stats = sync(public, DirectoryRemote(replica))
+
+    assert changed == [] and deleted == []
+    assert stats.bytes_sent == 0
+
+
+def test_bytes_sent_scale_with_change_not_catalogue(tmp_path):
+    sent = {}
+    for size in (4, 16):
+        public, replica = str(tmp_path / f'public{size}'), str(tmp_path / f'replica{size}')
+        data = make_catalog(categories=size)
+        write_public(public, data)
+        _, _, initial = sync(public, DirectoryRemote(replica))
+
+        data['categories'][0]['subcategories'][0]['tools'][0]['description'] = 'Edited.'
+        write_public(public, data)
+        changed, _, stats = sync(public, DirectoryRemote(replica))
+
+        assert sorted(changed) == ['.sync/catalog/cat-0/sub-0.json', CATALOG_NAME]
+        assert read(os.path.join(replica, CATALOG_NAME)) == read(os.path.join(public, CATALOG_NAME))
+        assert stats.bytes_sent < initial.bytes_sent / 20
+        sent[size] = stats.bytes_sent
+
+    # Same one-tool edit against a catalogue four times larger: same payload.
+    assert sent[4] == sent[16]
+
+
+def test_removed_subcategory_is_deleted_on_replica(tmp_path):
+    public, replica = str(tmp_path / 'public'), str(tmp_path / 'replica')
+    data = make_catalog()
+    write_public(public, data)
+    sync(public, DirectoryRemote(replica))
+
+    data['categories'][1]['subcategories'].pop()
+    write_public(public, data)
+    changed, deleted, _ = sync(public, DirectoryRemote(replica))
+
+    assert deleted == ['.sync/catalog/cat-1/sub-5.json']
+    assert not os.path.exists(os.path.join(replica, '.sync', 'catalog', 'cat-1', 'sub-5.json'))
+    assert read(os.path.join(replica, CATALOG_NAME)) == read(os.path.join(public, CATALOG_NAME))
+
+
+class FlakyRemote(DirectoryRemote):
+    # Fails after a fixed number of appends, like a dropped connection.
+
+    def __init__(self, root, appends):
+        super().__init__(root)
+        self.appends = appends
+
+    def append(self, path, data):
+        if self.appends == 0:
+            raise ConnectionError('connection dropped')
+        self.appends -= 1
+        super().append(path, data)
+
+
+def test_interrupted_sync_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr('catalog_sync.CHUNK_SIZE', 1024)
+    public, replica = str(tmp_path / 'public'), str(tmp_path / 'replica')
+    data = make_catalog(categories=2)
+    write_public(public, data)
+    sync(public, DirectoryRemote(replica))
+
+    # One large shard change, interrupted part-way through its chunks.
+    data['categories'][0]['subcategories'][0]['tools'] *= 10
+    write_public(public, data)
+    shard = catalog_shards(data)['.sync/catalog/cat-0/sub-0.json']
+    try:
+        sync(public, FlakyRemote(replica, appends=5), jobs=1)
+    except ConnectionError:
+        pass
+
+    changed, _, stats = sync(public, DirectoryRemote(replica))
+
+    assert '.sync/catalog/cat-0/sub-0.json' in changed
+    assert stats.bytes_resumed == 5 * 1024
+    assert stats.bytes_sent == len(shard) - 5 * 1024
+    assert read(os.path.join(replica, CATALOG_NAME)) == read(os.path.join(public, CATALOG_NAME))
+
+
+def test_path_changing_type_is_cleared_before_upload(tmp_path):
+    public, replica = str(tmp_path / 'public'), str(tmp_path / 'replica')
+    write_public(public, make_catalog(categories=1))
+    os.makedirs(os.path.join(public, 'assets', 'logo'))
+    with open(os.path.join(public, 'assets', 'logo', 'big.png'), 'wb') as f:
+        f.write(b'big')
+    with open(os.path.join(public, 'assets', 'icon'), 'wb') as f:
+        f.write(b'icon file')
+    sync(public, DirectoryRemote(replica))
+
+    # File becomes a directory and a directory becomes a file.
+    os.remove(os.path.join(public, 'assets', 'icon'))
+    os.makedirs(os.path.join(public, 'assets', 'icon'))
+    with open(os.path.join(public, 'assets', 'icon', 'small.png'), 'wb') as f:
+        f.write(b'small')
+    os.remove(os.path.join(public, 'assets', 'logo', 'big.png'))
+    os.rmdir(os.path.join(public, 'assets', 'logo'))
+    with open(os.path.join(public, 'assets', 'logo'), 'wb') as f:
+        f.write(b'logo file')
+    changed, deleted, _ = sync(public, DirectoryRemote(replica))
+
+    assert sorted(changed) == ['assets/icon/small.png', 'assets/logo']
+    assert sorted(deleted) == ['assets/icon', 'assets/logo/big.png']
+    assert read(os.path.join(replica, 'assets', 'icon', 'small.png')) == b'small'
+    assert read(os.path.join(replica, 'assets', 'logo')) == b'logo file'
+    assert sync(public, DirectoryRemote(replica))[:2] == ([], [])
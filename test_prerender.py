@@ -0,0 +1,157 @@
+import json
+import re
+
+import prerender
+
+
+def make_catalog():
+    return {
+        'name': 'AI LIBRARY',
+        'categories': [
+            {'id': 'audio', 'name': 'Audio & Music', 'icon': '🎵', 'subcategories': [
+                {'id': 'music-gen', 'name': 'Music Generation', 'tools': [
+                    {'id': 301, 'name': 'Suno', 'url': 'https://suno.ai',
+                     'description': 'AI music generation', 'pricing': 'Free / Paid'},
+                    {'id': 302, 'name': 'Udio', 'url': 'https://udio.com',
+                     'description': 'AI music creation', 'pricing': 'Free'},
+                ]},
+            ]},
+            {'id': 'code', 'name': 'Coding', 'subcategories': [
+                {'id': 'assistants', 'name': 'Assistants', 'tools': [
+                    {'id': 401, 'name': 'Cursor', 'url': 'https://cursor.com',
+                     'description': 'AI code editor', 'pricing': 'Paid', 'gem': True},
+                ]},
+            ]},
+        ],
+    }
+
+
+class Site:
+    def __init__(self, tmp_path, capsys):
+        self.catalog = tmp_path / 'catalog.json'
+        self.public = tmp_path / 'public'
+        self.state_path = tmp_path / 'state.json'
+        self.capsys = capsys
+        self.write(make_catalog())
+
+    def write(self, data):
+        self.catalog.write_text(json.dumps(data))
+
+    def run(self, *extra):
+        self.capsys.readouterr()
+        assert prerender.main(['--catalog', str(self.catalog), '--public', str(self.public),
+                               '--state', str(self.state_path), '--workers', '1', *extra]) == 0
+        out = self.capsys.readouterr().out
+        return [int(n) for n in re.search(r'Rendered: (\d+) pages \((\d+) unchanged, (\d+) removed\)', out).groups()]
+
+    def state(self):
+        return json.loads(self.state_path.read_text())
+
+    def page(self, path):
+        return self.public.joinpath(*path.strip('/').split('/'), 'index.html')
+
+    def sitemap_locs(self):
+        locs = []
+        for shard in sorted((self.public / 'sitemaps').iterdir()):
+            locs += re.findall(r'<loc>(.*?)</loc>', shard.read_text())
+        return locs
+
+
+def test_second_run_skips_unchanged_pages(tmp_path, capsys):
+    site = Site(tmp_path, capsys)
+    assert site.run() == [5, 0, 0]
+    assert 'Cursor' in site.page('/tool/cursor/').read_text()
+    assert '<h2 id="music-gen">Music Generation</h2>' in site.page('/category/audio/').read_text()
+    first = site.state()
+    assert first['/tool/suno/']['key'] == 'audio/music-gen/suno'
+
+    assert site.run() == [0, 5, 0]
+    assert site.state() == first
+    assert site.run('--force') == [5, 0, 0]
+
+
+def test_edit_rerenders_affected_pages_only(tmp_path, capsys):
+    site = Site(tmp_path, capsys)
+    site.run()
+    data = make_catalog()
+    data['categories'][1]['subcategories'][0]['tools'][0]['pricing'] = 'Free / $20'
+    site.write(data)
+    # The tool page and its category page; audio is untouched.
+    assert site.run() == [2, 3, 0]
+    assert 'Free / $20' in site.page('/tool/cursor/').read_text()
+
+
+def test_forced_rerender_keeps_lastmod(tmp_path, capsys):
+    site = Site(tmp_path, capsys)
+    site.run()
+    state = site.state()
+    for entry in state.values():
+        entry['lastmod'] = '2020-01-01'
+    site.state_path.write_text(json.dumps(state))
+
+    assert site.run('--force') == [5, 0, 0]
+    assert {entry['lastmod'] for entry in site.state().values()} == {'2020-01-01'}
+    assert '<lastmod>2020-01-01</lastmod>' in (site.public / 'sitemap.xml').read_text()
+
+
+def test_removed_tool_loses_its_page(tmp_path, capsys):
+    site = Site(tmp_path, capsys)
+    site.run()
+    data = make_catalog()
+    del data['categories'][0]['subcategories'][0]['tools'][1]
+    site.write(data)
+
+    # The category page and Suno, whose related list named Udio.
+    assert site.run() == [2, 2, 1]
+    assert not site.page('/tool/udio/').exists()
+    assert '/tool/udio/' not in site.state()
+    assert prerender.SITE_URL + '/tool/udio/' not in site.sitemap_locs()
+
+
+def test_stray_page_directories_are_removed_without_state(tmp_path, capsys):
+    site = Site(tmp_path, capsys)
+    site.run()
+    (site.public / 'tool' / 'gone').mkdir()
+    (site.public / 'category' / 'old').mkdir()
+    site.state_path.unlink()
+
+    assert site.run() == [5, 0, 2]
+    assert sorted(p.name for p in (site.public / 'tool').iterdir()) == ['cursor', 'suno', 'udio']
+    assert sorted(p.name for p in (site.public / 'category').iterdir()) == ['audio', 'code']
+
+
+def test_slug_survives_a_same_named_tool_added_first(tmp_path, capsys):
+    site = Site(tmp_path, capsys)
+    site.run()
+    data = make_catalog()
+    data['categories'][1]['subcategories'][0]['tools'].insert(0, {
+        'name': 'Suno', 'url': 'https://other.example.com', 'description': 'Other', 'pricing': 'Free'})
+    data['categories'].reverse()
+    site.write(data)
+
+    site.run()
+    assert 'AI music generation' in site.page('/tool/suno/').read_text()
+    assert 'Other' in site.page('/tool/suno-assistants/').read_text()
+
+
+def test_sitemap_is_sharded(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(prerender, 'SITEMAP_SHARD_SIZE', 2)
+    site = Site(tmp_path, capsys)
+    site.run()
+
+    shards = sorted(p.name for p in (site.public / 'sitemaps').iterdir())
+    # 2 static pages + 2 categories + 3 tools.
+    assert shards == ['sitemap-1.xml', 'sitemap-2.xml', 'sitemap-3.xml', 'sitemap-4.xml']
+    locs = site.sitemap_locs()
+    assert len(locs) == len(set(locs)) == 7
+    assert locs[0] == prerender.SITE_URL
+    index = (site.public / 'sitemap.xml').read_text()
+    assert re.findall(r'<loc>(.*?)</loc>', index) == [f'{prerender.SITE_URL}/sitemaps/{name}' for name in shards]
+
+    # Shrinking the catalogue drops the shards that are no longer needed.
+    data = make_catalog()
+    del data['categories'][1]
+    site.write(data)
+    site.run()
+    assert sorted(p.name for p in (site.public / 'sitemaps').iterdir()) == ['sitemap-1.xml', 'sitemap-2.xml',
+                                                                        'sitemap-3.xml']